@@ -1,6 +1,8 @@
 import subprocess
 import os
+import re
 import sys
+import glob
 import shutil
 
 # Colored output helpers
@@ -34,13 +36,64 @@ def prompt_yes_no(question, default='n'):
     return resp == 'y'
 
 def detect_gpu():
-    lspci_out = run_cmd('lspci', capture_output=True)
-    if 'NVIDIA' in lspci_out.upper():
+    lspci_out = run_cmd('lspci', capture_output=True) or ''
+    # Only display controllers, matched as whole words: "Intel Corporation"
+    # contains "ATI", and audio/USB lines name the same vendors.
+    display = '\n'.join(line for line in lspci_out.splitlines()
+                        if re.search(r'\b(VGA|3D|Display)\b', line))
+    if re.search(r'\bNVIDIA\b', display, re.IGNORECASE):
         return 'nvidia'
-    elif 'AMD' in lspci_out.upper() or 'ATI' in lspci_out.upper():
+    elif re.search(r'\b(AMD|ATI)\b', display):
         return 'amd'
     return None
 
+# amdgpu reports the BIOS carve-out as VRAM on APUs; real cards have more
+APU_MAX_VRAM = 2 * 1024 ** 3
+
+def read_sysfs(path):
+    try:
+        with open(path, 'r') as sysfs_file:
+            return sysfs_file.read().strip()
+    except OSError:
+        return None
+
+def render_gpu_integrated():
+    # True/False for the GPU the desktop renders on (the boot VGA device, as
+    # on hybrid laptops), None if sysfs has no DRM devices to go by.
+    devices = []
+    for card in sorted(glob.glob('/sys/class/drm/card[0-9]*')):
+        if '-' in os.path.basename(card):
+            continue  # connector, e.g. card0-DP-1
+        device = os.path.join(card, 'device')
+        vendor = read_sysfs(os.path.join(device, 'vendor'))
+        if vendor:
+            devices.append((read_sysfs(os.path.join(device, 'boot_vga')) == '1', vendor, device))
+    if not devices:
+        return None
+    _, vendor, device = max(devices, key=lambda item: item[0])
+
+    if vendor == '0x10de':
+        return False
+    if vendor == '0x8086':
+        # Arc cards (DG2 0x56xx, Battlemage 0xe2xx); everything else is an iGPU
+        device_id = read_sysfs(os.path.join(device, 'device')) or ''
+        return not device_id.startswith(('0x56', '0xe2'))
+    if vendor == '0x1002':
+        vram = read_sysfs(os.path.join(device, 'mem_info_vram_total'))
+        return vram is not None and int(vram) <= APU_MAX_VRAM
+    # virtual GPUs and anything unknown: assume there is little to spare
+    return True
+
+def default_perf_profile():
+    # Discrete GPUs keep the full look; integrated graphics get a lighter
+    # profile, tuned for battery life on laptops.
+    if not render_gpu_integrated():
+        return 'full'
+    power_supplies = '/sys/class/power_supply'
+    if os.path.isdir(power_supplies) and any(name.startswith('BAT') for name in os.listdir(power_supplies)):
+        return 'battery'
+    return 'low-latency'
+
 def main():
     # Ensure rsync is available for theme deployment
     install_pkgs(['rsync'])
@@ -64,7 +117,23 @@ def main():
     theme_src = './themes/dark/'
     theme_dest = os.path.expanduser('~/.config/hypr/themes/dark/')
     os.makedirs(theme_dest, exist_ok=True)
-    run_cmd(f'rsync -av --delete {theme_src} {theme_dest}')
+    # per-directory .gitignore files list generated state (waybar config,
+    # saved generate.py flags); keep it across re-runs
+    run_cmd(f'rsync -av --delete --filter=:-_.gitignore {theme_src} {theme_dest}')
+
+    # rofi runs script modes without a shell, so spell out the home directory
+    rofi_config = os.path.join(theme_dest, 'rofi', 'config.rasi')
+    with open(rofi_config) as f:
+        content = f.read()
+    with open(rofi_config, 'w') as f:
+        f.write(content.replace('~/', os.path.expanduser('~/')))
+
+    # Strip comments and defaults from the deployed kitty.conf so every new
+    # kitty parses a dozen lines instead of the fully documented file
+    run_cmd(f'python {theme_dest}scripts/kittyctl.py compact {theme_dest}kitty/kitty.conf')
+
+    # Build the launcher index now so the first SUPER+Space is already fast
+    run_cmd(f'python {theme_dest}scripts/launcher.py --rebuild')
 
     # Create symlinks for themed configs (only if destination doesn't exist)
     configs = ['waybar', 'kitty', 'rofi', 'dunst', 'swaylock', 'wlogout']
@@ -117,6 +186,11 @@ def main():
     else:
         print_color("No discrete GPU detected; skipping driver installation.", 'yellow')
 
+    # Render performance profiles from the deployed hyprland.conf
+    perf_profile = default_perf_profile()
+    print_color(f"Generating performance profiles (default: {perf_profile})...")
+    run_cmd(f'python {theme_dest}scripts/perfprofile.py generate --default {perf_profile}')
+
     # SDDM setup
     print_color("Setting up SDDM...")
     install_pkgs(['sddm'])
@@ -194,6 +268,11 @@ Session=hyprland.desktop
     print("    (should already source ~/.config/hypr/themes/dark/theme.conf)")
     print("  • Verify wallpaper command in hyprland.conf:")
     print("      exec-once = swww init && swww img ~/.config/hypr/themes/dark/wallpaper/wallpaper.png")
+    print("  • Switch render profile any time (full / low-latency / battery):")
+    print("      python ~/.config/hypr/themes/dark/scripts/perfprofile.py apply low-latency")
+    print("    (add 'source = ~/.config/hypr/profiles/active.conf' at the end of an older hyprland.conf)")
+    print("  • Clipboard history (SUPER+V) is stored in ~/.cache/cachyhyprdark/clipboard/")
+    print("    (older hyprland.conf: add the clipstore.py wl-paste exec-once lines from the starter config)")
     print("  • Reboot to launch Hyprland via SDDM")
     print("  • Troubleshooting: Arch Wiki (Hyprland / SDDM), CachyOS forums, or ~/.config/hypr/logs")
 
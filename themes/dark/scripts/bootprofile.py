@@ -0,0 +1,360 @@
+#!/usr/bin/python
+
+# Login-to-desktop boot profiler.
+#
+# `record` is started as the first exec-once in hyprland.conf. It logs, on
+# the CLOCK_BOOTTIME timeline, process start times from /proc, Hyprland IPC
+# events and component readiness probes until the desktop is up, then writes
+# a per-boot report and appends a summary to a rolling history file.
+#
+# `report` rebuilds the report from a recorded event log, so the analysis can
+# be run offline against saved logs.
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import datetime
+import subprocess
+
+import hypripc
+
+STATE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "cachyhyprdark", "boot"
+)
+HISTORY_FILE = "history.jsonl"
+HISTORY_LIMIT = 50
+
+CONFIG_FILES = [
+    "~/.config/hypr/hyprland.conf",
+    "~/.config/hypr/themes/dark/theme.conf",
+]
+
+# comm names (/proc/<pid>/comm, truncated to 15 chars) we take start times for
+WATCHED_PROCESSES = ["sddm", "sddm-helper", "Hyprland", "waybar", "swww-daemon", "dunst"]
+
+# layer-shell namespace that marks the bar as drawn on screen
+WAYBAR_NAMESPACE = "waybar"
+
+# report rows: (stage, source, name)
+STAGES = [
+    ("login", "proc", "sddm-helper"),
+    ("hyprland", "proc", "Hyprland"),
+    ("waybar started", "proc", "waybar"),
+    ("waybar ready", "ready", "waybar"),
+    ("wallpaper started", "proc", "swww-daemon"),
+    ("wallpaper ready", "ready", "wallpaper"),
+    ("dunst started", "proc", "dunst"),
+    ("dunst ready", "ready", "dunst"),
+]
+READY_COMPONENTS = ["waybar", "wallpaper", "dunst"]
+
+
+def boottime():
+    return time.clock_gettime(time.CLOCK_BOOTTIME)
+
+
+def read_boot_id():
+    with open("/proc/sys/kernel/random/boot_id", "r") as boot_id_file:
+        return boot_id_file.read().strip()
+
+
+def config_fingerprint():
+    digest = hashlib.sha1()
+    for path in CONFIG_FILES:
+        try:
+            with open(os.path.expanduser(path), "rb") as config_file:
+                digest.update(config_file.read())
+        except OSError:
+            digest.update(b"missing:" + path.encode("utf-8"))
+    return digest.hexdigest()[:10]
+
+
+def process_starts(names):
+    # Start time (seconds since boot) of the newest process for each name.
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+    starts = {}
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat", "r") as stat_file:
+                stat = stat_file.read()
+        except OSError:
+            continue
+
+        # comm is wrapped in parentheses and may itself contain spaces
+        comm = stat[stat.index("(") + 1:stat.rindex(")")]
+        if comm not in names:
+            continue
+        fields = stat[stat.rindex(")") + 2:].split()
+        start = int(fields[19]) / clock_ticks
+        starts[comm] = max(starts.get(comm, 0.0), start)
+    return starts
+
+
+def layer_namespaces():
+    layers = hypripc.request("layers", json_output=True)
+    namespaces = set()
+    for output in layers.values():
+        for level in output.get("levels", {}).values():
+            for layer in level:
+                namespaces.add(layer.get("namespace", ""))
+    return namespaces
+
+
+def dunst_ready():
+    # dunstctl answers over D-Bus only once dunst owns the notification name
+    return subprocess.call(["dunstctl", "is-paused"],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) == 0
+
+
+def wallpaper_ready():
+    # swww-daemon maps its layer before `swww img` runs, so only count the
+    # wallpaper once every output reports an image ("color: ..." until then)
+    try:
+        output = subprocess.run(["swww", "query"], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, timeout=2).stdout.decode("utf-8")
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    outputs = [line for line in output.splitlines() if line.strip()]
+    return bool(outputs) and all("image:" in line for line in outputs)
+
+
+def record(log_path, timeout, poll_interval):
+    log_file = open(log_path, "w")
+
+    def log(source, name, data="", t=None):
+        entry = {"t": round(boottime() if t is None else t, 3),
+                 "source": source, "name": name, "data": data}
+        log_file.write(json.dumps(entry) + "\n")
+        # a logout or SIGTERM mid-window must not leave a half-written line
+        log_file.flush()
+
+    log("meta", "start", json.dumps({
+        "boot_id": read_boot_id(),
+        "config": config_fingerprint(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+    }))
+
+    seen_processes = {}
+    ready = set()
+    deadline = boottime() + timeout
+
+    try:
+        stream = hypripc.EventStream()
+    except (OSError, RuntimeError) as e:
+        log("meta", "ipc-unavailable", str(e))
+        stream = None
+
+    while boottime() < deadline and len(ready) < len(READY_COMPONENTS):
+        if stream:
+            try:
+                received = stream.read(timeout=poll_interval)
+            except EOFError:
+                log("meta", "ipc-closed")
+                stream = None
+                received = []
+            for name, data in received:
+                log("ipc", name, data)
+                if name == "openlayer" and data.startswith(WAYBAR_NAMESPACE) and "waybar" not in ready:
+                    ready.add("waybar")
+                    log("ready", "waybar", "event")
+        else:
+            time.sleep(poll_interval)
+
+        missing = [name for name in WATCHED_PROCESSES if name not in seen_processes]
+        if missing:
+            for name, start in process_starts(missing).items():
+                seen_processes[name] = start
+                log("proc", name, t=start)
+
+        # The bar may have mapped before we subscribed to the event socket,
+        # so fall back to asking for the current layers.
+        if "waybar" not in ready:
+            try:
+                namespaces = layer_namespaces()
+            except (OSError, RuntimeError, ValueError):
+                namespaces = set()
+            if any(namespace.startswith(WAYBAR_NAMESPACE) for namespace in namespaces):
+                ready.add("waybar")
+                log("ready", "waybar", "layers")
+
+        if "wallpaper" not in ready and "swww-daemon" in seen_processes and wallpaper_ready():
+            ready.add("wallpaper")
+            log("ready", "wallpaper", "swww query")
+
+        if "dunst" not in ready and "dunst" in seen_processes and dunst_ready():
+            ready.add("dunst")
+            log("ready", "dunst", "dbus")
+
+    if stream:
+        stream.close()
+    log("meta", "end", "complete" if len(ready) == len(READY_COMPONENTS) else "timeout")
+    log_file.close()
+
+
+def read_json_lines(path):
+    # Skips lines that do not parse, e.g. one cut short by a crash
+    entries = []
+    with open(path, "r") as json_file:
+        for line in json_file:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+def load_log(log_path):
+    return read_json_lines(log_path)
+
+
+def build_report(entries):
+    meta = {}
+    times = {}
+    for entry in entries:
+        if entry["source"] == "meta" and entry["name"] == "start":
+            meta = json.loads(entry["data"])
+        elif entry["source"] in ("proc", "ready"):
+            key = (entry["source"], entry["name"])
+            # first readiness signal wins; a proc may be re-logged on replay
+            if key not in times:
+                times[key] = entry["t"]
+
+    origin = times.get(("proc", "sddm-helper"), times.get(("proc", "Hyprland")))
+
+    stages = {}
+    for stage, source, name in STAGES:
+        t = times.get((source, name))
+        if t is not None and origin is not None:
+            stages[stage] = round(t - origin, 3)
+
+    readies = [times.get(("ready", name)) for name in READY_COMPONENTS]
+    if origin is not None and all(t is not None for t in readies):
+        stages["desktop ready"] = round(max(readies) - origin, 3)
+
+    return {
+        "boot_id": meta.get("boot_id", "unknown"),
+        "date": meta.get("date", ""),
+        "config": meta.get("config", ""),
+        "origin_since_boot": origin,
+        "stages": stages,
+    }
+
+
+def format_report(report):
+    lines = [
+        f"Boot {report['boot_id']}  {report['date']}  config {report['config']}",
+    ]
+    if report["origin_since_boot"] is None:
+        lines.append("No login or Hyprland start recorded.")
+        return "\n".join(lines) + "\n"
+
+    lines.append(f"Login at {report['origin_since_boot']:.2f}s after kernel boot")
+    lines.append("")
+    lines.append(f"{'stage':<20}{'since login':>12}{'delta':>10}")
+
+    # chronological order, so each delta is the gap to the previous stage
+    previous = 0.0
+    for stage, offset in sorted(report["stages"].items(), key=lambda item: item[1]):
+        lines.append(f"{stage:<20}{offset:>11.2f}s{offset - previous:>+9.2f}s")
+        previous = offset
+    for stage in [row[0] for row in STAGES] + ["desktop ready"]:
+        if stage not in report["stages"]:
+            lines.append(f"{stage:<20}{'-':>12}")
+    return "\n".join(lines) + "\n"
+
+
+def append_history(state_dir, report):
+    history_path = os.path.join(state_dir, HISTORY_FILE)
+    history = load_history(history_path)
+    history = [entry for entry in history if entry["boot_id"] != report["boot_id"]]
+    history.append(report)
+
+    # keep per-boot logs and reports only for boots still in the history
+    for entry in history[:-HISTORY_LIMIT]:
+        for suffix in (".log", ".txt"):
+            try:
+                os.remove(os.path.join(state_dir, entry["boot_id"] + suffix))
+            except OSError:
+                pass
+    history = history[-HISTORY_LIMIT:]
+
+    tmp_path = history_path + ".tmp"
+    with open(tmp_path, "w") as history_file:
+        for entry in history:
+            history_file.write(json.dumps(entry) + "\n")
+    os.replace(tmp_path, history_path)
+
+
+def load_history(history_path):
+    if not os.path.exists(history_path):
+        return []
+    return read_json_lines(history_path)
+
+
+def format_history(history):
+    columns = ["hyprland", "waybar ready", "wallpaper ready", "dunst ready", "desktop ready"]
+    lines = [f"{'date':<21}{'config':<12}" + "".join(f"{column:>17}" for column in columns)]
+    for entry in history:
+        row = f"{entry['date']:<21}{entry['config']:<12}"
+        for column in columns:
+            value = entry["stages"].get(column)
+            row += f"{'-':>17}" if value is None else f"{value:>16.2f}s"
+        lines.append(row)
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--state-dir", default=STATE_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="profile the current login")
+    record_parser.add_argument("--timeout", type=float, default=60.0)
+    record_parser.add_argument("--poll-interval", type=float, default=0.25)
+    record_parser.add_argument("--force", action="store_true",
+                               help="record even if this boot was already profiled")
+
+    report_parser = subparsers.add_parser("report", help="analyse a recorded event log")
+    report_parser.add_argument("log")
+    report_parser.add_argument("--save", action="store_true",
+                               help="also append the result to the history file")
+
+    history_parser = subparsers.add_parser("history", help="compare previous boots")
+    history_parser.add_argument("-n", type=int, default=10)
+
+    args = parser.parse_args()
+    os.makedirs(args.state_dir, exist_ok=True)
+
+    if args.command == "record":
+        boot_id = read_boot_id()
+        log_path = os.path.join(args.state_dir, f"{boot_id}.log")
+        report_path = os.path.join(args.state_dir, f"{boot_id}.txt")
+        # Hyprland restarts within the same boot are not logins
+        if os.path.exists(report_path) and not args.force:
+            return
+
+        record(log_path, args.timeout, args.poll_interval)
+        report = build_report(load_log(log_path))
+        with open(report_path, "w") as report_file:
+            report_file.write(format_report(report))
+        append_history(args.state_dir, report)
+
+    elif args.command == "report":
+        report = build_report(load_log(args.log))
+        sys.stdout.write(format_report(report))
+        if args.save:
+            append_history(args.state_dir, report)
+
+    elif args.command == "history":
+        history = load_history(os.path.join(args.state_dir, HISTORY_FILE))
+        sys.stdout.write(format_history(history[-args.n:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/python
+
+# Bounded clipboard history.
+#
+# Wired up in hyprland.conf as
+#   wl-paste --type text --watch python .../clipstore.py store
+#   wl-paste --type image --watch python .../clipstore.py store
+#
+# Each payload is stored once, under its sha256, in a blob directory;
+# index.json lists the entries most recently used first, with a short
+# preview. Copying something already in the history just moves it to the
+# front. Small text and large/binary payloads (images, huge pastes) live in
+# separate pools, each capped by entry count and total bytes, and the least
+# recently used entries are evicted first.
+#
+# `pick` shows the history in rofi straight from the index, decoding only the
+# entry that gets selected.
+#
+# The history holds whatever was copied, so it is private to the user: the
+# directories are created 0700 and every file 0600.
+
+import os
+import sys
+import json
+import fcntl
+import hashlib
+import argparse
+import subprocess
+
+STATE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "cachyhyprdark", "clipboard"
+)
+INDEX_FILE = "index.json"
+LOCK_FILE = "lock"
+BLOB_DIR = "blobs"
+
+# payloads above this go to the "large" pool
+LARGE_THRESHOLD = 256 * 1024
+# payloads above this are not stored at all
+MAX_ENTRY_BYTES = 32 * 1024 * 1024
+
+# pool -> (max entries, max total bytes)
+POOL_LIMITS = {
+    "text": (1000, 16 * 1024 * 1024),
+    "large": (25, 128 * 1024 * 1024),
+}
+
+PREVIEW_LENGTH = 80
+
+IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+]
+
+
+def sniff_mime(data):
+    for signature, mime in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return mime
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if b"\x00" in data[:8192]:
+        return "application/octet-stream"
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return "application/octet-stream"
+    return "text/plain;charset=utf-8"
+
+
+def format_size(size):
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KiB"
+    return f"{size / (1024 * 1024):.1f} MiB"
+
+
+def make_preview(data, mime):
+    if not mime.startswith("text/"):
+        return f"[{mime} {format_size(len(data))}]"
+    text = " ".join(data[:PREVIEW_LENGTH * 4].decode("utf-8", errors="replace").split())
+    if len(text) > PREVIEW_LENGTH:
+        text = text[:PREVIEW_LENGTH - 1] + "…"
+    if len(data) > LARGE_THRESHOLD:
+        text += f"  [{format_size(len(data))}]"
+    return text
+
+
+def pool_for(size, mime):
+    if mime.startswith("text/") and size <= LARGE_THRESHOLD:
+        return "text"
+    return "large"
+
+
+class History:
+    # Index plus blob directory, guarded by an exclusive flock so concurrent
+    # watchers (text + image) and the picker never interleave writes.
+
+    def __init__(self, state_dir):
+        self.state_dir = state_dir
+        self.blob_dir = os.path.join(state_dir, BLOB_DIR)
+        self.index_path = os.path.join(state_dir, INDEX_FILE)
+        self.lock_file = None
+        self.entries = []
+
+    def __enter__(self):
+        os.makedirs(self.blob_dir, mode=0o700, exist_ok=True)
+        # tighten a history left readable by an older version
+        for path in (self.state_dir, self.blob_dir):
+            os.chmod(path, 0o700)
+        self.lock_file = open(os.path.join(self.state_dir, LOCK_FILE), "w")
+        fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as index_file:
+                self.entries = json.load(index_file)["entries"]
+        return self
+
+    def __exit__(self, *exc):
+        self.lock_file.close()
+
+    def blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest)
+
+    def save(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as index_file:
+            json.dump({"version": 1, "entries": self.entries}, index_file)
+        os.replace(tmp_path, self.index_path)
+
+    def find(self, digest):
+        for position, entry in enumerate(self.entries):
+            if entry["hash"] == digest:
+                return position
+        return None
+
+    def touch(self, position):
+        self.entries.insert(0, self.entries.pop(position))
+
+    def add(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        position = self.find(digest)
+        if position is not None:
+            self.touch(position)
+            return
+
+        mime = sniff_mime(data)
+        tmp_path = self.blob_path(digest) + ".tmp"
+        with open(tmp_path, "wb") as blob_file:
+            blob_file.write(data)
+        os.replace(tmp_path, self.blob_path(digest))
+
+        self.entries.insert(0, {
+            "hash": digest,
+            "mime": mime,
+            "size": len(data),
+            "pool": pool_for(len(data), mime),
+            "preview": make_preview(data, mime),
+        })
+        self.evict()
+
+    def evict(self):
+        kept = []
+        usage = {pool: [0, 0] for pool in POOL_LIMITS}
+        for entry in self.entries:
+            count, size = usage[entry["pool"]]
+            max_count, max_size = POOL_LIMITS[entry["pool"]]
+            # the newest entry of a pool survives even if it alone is over budget
+            if count and (count + 1 > max_count or size + entry["size"] > max_size):
+                self.remove_blob(entry["hash"])
+                continue
+            usage[entry["pool"]] = [count + 1, size + entry["size"]]
+            kept.append(entry)
+        self.entries = kept
+
+    def remove_blob(self, digest):
+        try:
+            os.remove(self.blob_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for entry in self.entries:
+            self.remove_blob(entry["hash"])
+        self.entries = []
+
+
+def store(state_dir):
+    # wl-paste sets CLIPBOARD_STATE; skip clears and password-manager copies
+    if os.environ.get("CLIPBOARD_STATE", "data") != "data":
+        return
+
+    data = sys.stdin.buffer.read(MAX_ENTRY_BYTES + 1)
+    if not data.strip() or len(data) > MAX_ENTRY_BYTES:
+        return
+
+    with History(state_dir) as history:
+        history.add(data)
+        history.save()
+
+
+def rofi_rows(entries, blob_dir):
+    rows = []
+    for entry in entries:
+        row = entry["preview"].replace("\n", " ").replace("\0", "")
+        # images show up as their own thumbnail, loaded lazily by rofi
+        if entry["mime"].startswith("image/"):
+            row += f"\0icon\x1f{os.path.join(blob_dir, entry['hash'])}"
+        rows.append(row)
+    return "\n".join(rows) + "\n"
+
+
+def pick(state_dir):
+    with History(state_dir) as history:
+        entries = list(history.entries)
+    if not entries:
+        return
+
+    result = subprocess.run(
+        ["rofi", "-dmenu", "-i", "-p", "clipboard", "-format", "i", "-show-icons"],
+        input=rofi_rows(entries, os.path.join(state_dir, BLOB_DIR)).encode("utf-8"),
+        stdout=subprocess.PIPE
+    )
+    selection = result.stdout.decode("utf-8").strip()
+    if result.returncode != 0 or not selection.isdigit():
+        return
+
+    entry = entries[int(selection)]
+    with History(state_dir) as history:
+        position = history.find(entry["hash"])
+        if position is None:
+            return
+        with open(history.blob_path(entry["hash"]), "rb") as blob_file:
+            data = blob_file.read()
+        subprocess.run(["wl-copy", "--type", entry["mime"]], input=data)
+        # the watcher will see this copy too; it only moves the entry to the front
+        history.touch(position)
+        history.save()
+
+
+def main():
+    # blobs, index and lock are only ever for this user
+    os.umask(0o077)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--state-dir", default=STATE_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("store", help="add stdin to the history (wl-paste --watch)")
+    subparsers.add_parser("pick", help="choose an entry with rofi and copy it")
+    subparsers.add_parser("list", help="print previews, most recent first")
+    subparsers.add_parser("wipe", help="delete the whole history")
+
+    args = parser.parse_args()
+
+    if args.command == "store":
+        store(args.state_dir)
+
+    elif args.command == "pick":
+        pick(args.state_dir)
+
+    elif args.command == "list":
+        with History(args.state_dir) as history:
+            for entry in history.entries:
+                print(entry["preview"])
+
+    elif args.command == "wipe":
+        with History(args.state_dir) as history:
+            history.clear()
+            history.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/python
+
+# Automatic game mode.
+#
+# Sleeps on the Hyprland event socket and, whenever focus or fullscreen
+# state changes, checks the active window. While a fullscreen window or a
+# known game has focus it sends the stripped render profile in one batched
+# request and switches waybar to its light bar (workspaces and a once-a-minute
+# clock, see waybar/generate.py --light), so the 1 s pollers stop waking up.
+# Leaving game mode, or exiting the daemon, restores the active profile from
+# ~/.config/hypr/profiles/active.conf and the full bar. A config reload resets
+# every keyword, so the game profile is re-sent after one.
+#
+# Point HYPRIPC_DIR at a fake server to run it without Hyprland.
+
+import os
+import re
+import sys
+import signal
+import argparse
+import subprocess
+
+import hypripc
+import perfprofile
+
+# Steam runs games as steam_app_<id>; gamescope wraps the rest
+GAME_CLASSES = [r"^steam_app_\d+$", r"^gamescope$"]
+GAME_PROFILE = "low-latency"
+FALLBACK_PROFILE = "full"
+
+# events after which the active window may have changed state
+TRIGGER_EVENTS = {"activewindowv2", "fullscreen", "workspacev2", "closewindow", "movewindowv2",
+                  "configreloaded"}
+
+# deployed next door, like this directory
+WAYBAR_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "waybar")
+
+
+def light_bar(light):
+    subprocess.call([sys.executable, os.path.join(WAYBAR_DIR, "generate.py"),
+                     "--light", "on" if light else "off"])
+
+
+def light_bar_left_on():
+    # a previous daemon that was killed before it could restore the bar
+    return os.path.exists(os.path.join(WAYBAR_DIR, "light-bars"))
+
+
+def is_fullscreen(window):
+    # "fullscreen" is a bool on older Hyprland and a mode bitmask on newer
+    # ones (1 = maximized, 2 = fullscreen); maximized windows do not count
+    value = window.get("fullscreen") if window else None
+    if isinstance(value, bool):
+        return value
+    return isinstance(value, int) and bool(value & 2)
+
+
+def is_game(window, game_classes):
+    if not window:
+        return False
+    if is_fullscreen(window):
+        return True
+    window_class = window.get("class", "")
+    return any(pattern.search(window_class) for pattern in game_classes)
+
+
+class GameMode:
+
+    def __init__(self, game_classes, profile_dir, game_profile, light_bar):
+        self.game_classes = game_classes
+        self.profile_dir = profile_dir
+        self.game_profile = game_profile
+        self.light_bar = light_bar
+        self.active = False
+
+    def send_game_profile(self):
+        perfprofile.send_profile(self.game_profile,
+                                 perfprofile.load_profile(self.game_profile, self.profile_dir))
+
+    def enter(self):
+        self.send_game_profile()
+        self.active = True
+        if self.light_bar:
+            light_bar(True)
+
+    def leave(self):
+        # restore the bar first so it comes back even if Hyprland is gone
+        if self.light_bar:
+            light_bar(False)
+        restore = perfprofile.active_profile(self.profile_dir) or FALLBACK_PROFILE
+        perfprofile.send_profile(restore, perfprofile.load_profile(restore, self.profile_dir))
+        self.active = False
+
+    def update(self):
+        window = hypripc.request("activewindow", json_output=True)
+        wanted = is_game(window, self.game_classes)
+        if wanted and not self.active:
+            self.enter()
+        elif not wanted and self.active:
+            self.leave()
+
+    def try_update(self, reloaded=False):
+        # one failed request (Hyprland busy, profile missing) must not end the daemon
+        try:
+            # the reload put the configured values back; still in a game?
+            if reloaded and self.active:
+                self.send_game_profile()
+            self.update()
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"gamemode: {e}", file=sys.stderr)
+
+    def run(self):
+        with hypripc.EventStream() as stream:
+            self.try_update()
+            while True:
+                try:
+                    received = stream.read()
+                except EOFError:
+                    return
+                names = {name for name, _ in received}
+                if names & TRIGGER_EVENTS:
+                    self.try_update(reloaded="configreloaded" in names)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--game-class", action="append", default=[],
+                        help="extra window class regex treated as a game (repeatable)")
+    parser.add_argument("--profile", default=GAME_PROFILE, choices=list(perfprofile.PROFILES))
+    parser.add_argument("--profile-dir", default=perfprofile.PROFILE_DIR)
+    parser.add_argument("--keep-bar", action="store_true",
+                        help="keep the full waybar in game mode")
+
+    args = parser.parse_args()
+
+    game_classes = [re.compile(pattern) for pattern in GAME_CLASSES + args.game_class]
+    game_mode = GameMode(game_classes, args.profile_dir, args.profile, not args.keep_bar)
+    if light_bar_left_on():
+        light_bar(False)
+
+    # turn SIGTERM (logout, pkill) into a normal exit so `finally` restores
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        game_mode.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if game_mode.active:
+            try:
+                game_mode.leave()
+            except (OSError, RuntimeError) as e:
+                print(f"gamemode: could not restore profile: {e}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/python
+
+# Resident Hyprland command dispatcher.
+#
+# `serve` (started from hyprland.conf) reads IPC commands, one per line, from
+# a fifo so bar actions and keybinds can use a shell builtin instead of
+# forking hyprctl for every event:
+#
+#   read pid 2>/dev/null < $XDG_RUNTIME_DIR/hyprdispatch.pid && kill -0 $pid 2>/dev/null \
+#       && echo 'dispatch workspace e+1' 1<> $XDG_RUNTIME_DIR/hyprdispatch.fifo \
+#       || hyprctl dispatch workspace e+1
+#
+# The pidfile check catches a fifo left behind by a dispatcher that was
+# killed, so the command goes to hyprctl instead of into a fifo nobody
+# reads. `1<>` opens the fifo read-write, so the open itself never waits for
+# a reader. A write can still block if a live dispatcher stops reading and
+# the pipe buffer (64 KiB) fills up.
+#
+# Commands arriving within a short window are sent to Hyprland as one
+# batched request, and runs of relative workspace moves (fast scrolling)
+# are coalesced into a single move. Hyprland answers one request per
+# connection, so each flush is one connect to the command socket.
+#
+# The dispatcher follows Hyprland's event socket and exits, removing the
+# fifo and pidfile, when its Hyprland instance goes away. On start it
+# replaces any fifo left over from a previous run, dropping stale commands.
+
+import os
+import re
+import sys
+import stat
+import time
+import select
+import signal
+import argparse
+
+import hypripc
+
+FIFO_PATH = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}"),
+    "hyprdispatch.fifo"
+)
+# gather a burst for this long after its first command...
+COALESCE_WINDOW = 0.015
+# ...but never hold a command back longer than this
+MAX_DELAY = 0.05
+
+RELATIVE_WORKSPACE = re.compile(r"^dispatch workspace ([emr])([+-]\d+)$")
+
+
+def coalesce(commands):
+    # Merge adjacent relative workspace moves with the same anchor:
+    # e+1, e+1, e-1, e+1 -> e+2. Moves that cancel out are dropped.
+    merged = []
+    pending = None  # (anchor, steps)
+
+    def flush_pending():
+        if pending and pending[1] != 0:
+            merged.append(f"dispatch workspace {pending[0]}{pending[1]:+d}")
+
+    for command in commands:
+        match = RELATIVE_WORKSPACE.match(command)
+        if match:
+            anchor, steps = match.group(1), int(match.group(2))
+            if pending and pending[0] == anchor:
+                pending = (anchor, pending[1] + steps)
+                continue
+            flush_pending()
+            pending = (anchor, steps)
+            continue
+        flush_pending()
+        pending = None
+        merged.append(command)
+
+    flush_pending()
+    return merged
+
+
+def send(commands):
+    commands = coalesce(commands)
+    if len(commands) == 1:
+        return hypripc.request(commands[0])
+    return hypripc.batch(commands)
+
+
+def wait_readable(fd, stream):
+    # Block until the fifo has data. Returns False once Hyprland closes the
+    # event socket; the events themselves are only drained.
+    while True:
+        ready, _, _ = select.select([fd, stream], [], [])
+        if stream in ready:
+            try:
+                stream.read()
+            except EOFError:
+                return False
+        if fd in ready:
+            return True
+
+
+def read_burst(fd):
+    # Read what is waiting, then keep reading until the fifo has been quiet
+    # for COALESCE_WINDOW or MAX_DELAY has passed.
+    data = os.read(fd, 4096)
+    deadline = time.monotonic() + MAX_DELAY
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        ready, _, _ = select.select([fd], [], [], min(COALESCE_WINDOW, remaining))
+        if not ready:
+            break
+        data += os.read(fd, 4096)
+    return data
+
+
+def pid_path(fifo_path):
+    return os.path.splitext(fifo_path)[0] + ".pid"
+
+
+def serve(fifo_path):
+    # connect first: without a running Hyprland there is nothing to serve
+    stream = hypripc.EventStream()
+    if os.path.exists(fifo_path):
+        if not stat.S_ISFIFO(os.stat(fifo_path).st_mode):
+            raise RuntimeError(f"{fifo_path} exists and is not a fifo")
+        os.remove(fifo_path)
+    os.mkfifo(fifo_path, 0o600)
+
+    # O_RDWR keeps a writer open ourselves, so the fifo never hits EOF
+    # between clients and we can simply block in select().
+    fd = os.open(fifo_path, os.O_RDWR)
+    # shell clients check this before writing
+    with open(pid_path(fifo_path) + ".tmp", "w") as pid_file:
+        pid_file.write(f"{os.getpid()}\n")
+    os.replace(pid_path(fifo_path) + ".tmp", pid_path(fifo_path))
+    buffer = b""
+    try:
+        while wait_readable(fd, stream):
+            buffer += read_burst(fd)
+            *lines, buffer = buffer.split(b"\n")
+            commands = [line.decode("utf-8", errors="replace").strip() for line in lines]
+            commands = [command for command in commands if command]
+            if not commands:
+                continue
+            try:
+                send(commands)
+            except (OSError, RuntimeError) as e:
+                print(f"hyprdispatch: {e}", file=sys.stderr)
+    finally:
+        os.close(fd)
+        stream.close()
+        # a fifo without a reader would swallow every client's commands
+        os.remove(pid_path(fifo_path))
+        os.remove(fifo_path)
+
+
+def client(fifo_path, commands):
+    try:
+        # O_NONBLOCK fails with ENXIO instead of hanging if nobody is reading
+        fd = os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+    except OSError:
+        send(commands)
+        return
+    try:
+        os.write(fd, ("\n".join(commands) + "\n").encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fifo", default=FIFO_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("serve", help="run the resident dispatcher")
+
+    send_parser = subparsers.add_parser("send", help="queue IPC commands (falls back to a direct request)")
+    send_parser.add_argument("commands", nargs="+")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            serve(args.fifo)
+        except KeyboardInterrupt:
+            pass
+
+    elif args.command == "send":
+        client(args.fifo, args.commands)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/python
+
+# Minimal Hyprland IPC helpers shared by the theme scripts.
+#
+# Hyprland exposes two unix sockets per instance:
+#   .socket.sock  - request/reply (what hyprctl talks to), one request per connection
+#   .socket2.sock - event stream, lines of "EVENT>>DATA"
+#
+# Set HYPRIPC_DIR to point every script at another directory holding
+# both sockets (e.g. a fake server used for offline testing).
+
+import os
+import json
+import socket
+
+COMMAND_SOCKET = ".socket.sock"
+EVENT_SOCKET = ".socket2.sock"
+
+
+def instance_dir():
+    override = os.environ.get("HYPRIPC_DIR")
+    if override:
+        return override
+
+    signature = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE")
+    if not signature:
+        raise RuntimeError("HYPRLAND_INSTANCE_SIGNATURE is not set; is Hyprland running?")
+
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+    # Hyprland >= 0.40 uses $XDG_RUNTIME_DIR/hypr, older builds used /tmp/hypr
+    for base in (os.path.join(runtime_dir, "hypr"), "/tmp/hypr"):
+        path = os.path.join(base, signature)
+        if os.path.isdir(path):
+            return path
+    return os.path.join(runtime_dir, "hypr", signature)
+
+
+def command_socket_path():
+    return os.path.join(instance_dir(), COMMAND_SOCKET)
+
+
+def event_socket_path():
+    return os.path.join(instance_dir(), EVENT_SOCKET)
+
+
+def request(command, json_output=False, timeout=2.0):
+    if json_output:
+        command = "j/" + command
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(command_socket_path())
+        sock.sendall(command.encode("utf-8"))
+
+        chunks = []
+        while True:
+            chunk = sock.recv(8192)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    reply = b"".join(chunks).decode("utf-8", errors="replace")
+    if json_output:
+        return json.loads(reply)
+    return reply
+
+
+def batch(commands, timeout=2.0):
+    # Same wire format as `hyprctl --batch "cmd1 ; cmd2"`: one round trip,
+    # applied by Hyprland in a single pass.
+    commands = [command.strip() for command in commands if command.strip()]
+    if not commands:
+        return ""
+    return request("[[BATCH]]" + ";".join(commands), timeout=timeout)
+
+
+def parse_event(line):
+    name, sep, data = line.partition(">>")
+    if not sep:
+        return None
+    return name, data
+
+
+class EventStream:
+    # Line-buffered reader for the event socket. read() returns the events
+    # received within `timeout` seconds ([] when idle) and raises EOFError
+    # once Hyprland closes the socket.
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(event_socket_path())
+        self.buffer = b""
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def read(self, timeout=None):
+        self.sock.settimeout(timeout)
+        try:
+            chunk = self.sock.recv(8192)
+        except socket.timeout:
+            return []
+        if not chunk:
+            raise EOFError("Hyprland event socket closed")
+
+        self.buffer += chunk
+        *lines, self.buffer = self.buffer.split(b"\n")
+        events = []
+        for line in lines:
+            event = parse_event(line.decode("utf-8", errors="replace"))
+            if event:
+                events.append(event)
+        return events
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
@@ -0,0 +1,214 @@
+#!/usr/bin/python
+
+# Single-instance kitty launcher and kitty.conf compactor.
+#
+# `launch` opens every window in one shared kitty process listening on
+# $XDG_RUNTIME_DIR/kitty.sock, speaking kitty's remote-control protocol
+# directly, so new windows skip process start-up and config parsing. Named
+# windows (--name htop) get their own window class and are focused through
+# Hyprland IPC when already open, instead of spawning duplicates.
+#
+# `compact` rewrites a kitty.conf without comments, blank lines, repeated
+# settings and values equal to kitty's defaults. The setup script runs it on
+# the deployed copy; the documented original stays in the repo.
+
+import os
+import re
+import sys
+import json
+import shlex
+import socket
+import argparse
+import subprocess
+
+import hypripc
+
+SOCKET_PATH = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}"),
+    "kitty.sock"
+)
+KITTY_VERSION = [0, 26, 0]
+DEFAULT_CLASS = "kitty"
+CLASS_PREFIX = "kitty-"
+
+# options that may legitimately appear more than once
+MULTI_VALUE_OPTIONS = {
+    "action_alias", "env", "exe_search_path", "font_features", "include", "globinclude",
+    "envinclude", "kitten_alias", "map", "modify_font", "mouse_map", "narrow_symbols",
+    "remote_control_password", "symbol_map", "watcher",
+}
+
+# Defaults for options our kitty.conf sets but whose commented default line
+# was edited away. Everything else is read from the "# option value" lines
+# of kitty's documented config.
+KITTY_DEFAULTS = {
+    "font_family": "monospace",
+    "bold_font": "auto",
+    "italic_font": "auto",
+    "bold_italic_font": "auto",
+    "font_size": "11.0",
+    "cursor_shape": "block",
+    "cursor_blink_interval": "-1",
+    "cursor_stop_blinking_after": "15.0",
+    "enable_audio_bell": "yes",
+    "hide_window_decorations": "no",
+    "background_opacity": "1.0",
+    "allow_remote_control": "no",
+}
+
+DEFAULT_LINE = re.compile(r"^# ([a-z_][a-z0-9_]*) (.*)$")
+
+
+def normalize(value):
+    return " ".join(value.split())
+
+
+def compact(lines):
+    defaults = dict(KITTY_DEFAULTS)
+    settings = []
+    for line in lines:
+        stripped = line.strip()
+        match = DEFAULT_LINE.match(stripped)
+        if match and match.group(1) not in MULTI_VALUE_OPTIONS:
+            defaults.setdefault(match.group(1), normalize(match.group(2)))
+            continue
+        if not stripped or stripped.startswith("#"):
+            continue
+        key, _, value = stripped.partition(" ")
+        settings.append((key, value.strip()))
+
+    # single-valued options: the last assignment wins, as in kitty
+    last = {key: position for position, (key, _) in enumerate(settings)}
+    compacted = []
+    for position, (key, value) in enumerate(settings):
+        if key not in MULTI_VALUE_OPTIONS:
+            if last[key] != position or defaults.get(key) == normalize(value):
+                continue
+        compacted.append(f"{key} {value}")
+    return compacted
+
+
+def compact_file(path):
+    with open(path, "r") as config_file:
+        lines = config_file.readlines()
+    compacted = compact(lines)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as config_file:
+        config_file.write(f"# compacted by kittyctl.py from {len(lines)} lines; "
+                          "see the repo copy for documentation\n")
+        config_file.write("\n".join(compacted) + "\n")
+    os.replace(tmp_path, path)
+
+
+def remote_command(cmd, payload, timeout=2.0):
+    message = {"cmd": cmd, "version": KITTY_VERSION, "no_response": False, "payload": payload}
+    request = b"\x1bP@kitty-cmd" + json.dumps(message).encode("utf-8") + b"\x1b\\"
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(SOCKET_PATH)
+        sock.sendall(request)
+        reply = b""
+        while not reply.endswith(b"\x1b\\"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            reply += chunk
+
+    response = json.loads(reply[len(b"\x1bP@kitty-cmd"):-len(b"\x1b\\")] or b"{}")
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error", "kitty did not answer"))
+    return response.get("data")
+
+
+def find_window(window_class):
+    for client in hypripc.request("clients", json_output=True):
+        if client.get("class") == window_class:
+            return client["address"]
+    return None
+
+
+def spawn_instance(window_class, fullscreen, title, command):
+    # Becomes the shared instance that later launches talk to, so the process
+    # keeps the default class: windows inherit it. A named first window gets
+    # its own class from a startup session read on stdin instead.
+    args = ["kitty", "--listen-on", f"unix:{SOCKET_PATH}", "-o", "allow_remote_control=yes",
+            "--class", DEFAULT_CLASS]
+    if fullscreen:
+        args.append("--start-as=fullscreen")
+    window_args = (["--title", title] if title else []) + command
+
+    session = None
+    if window_class:
+        session = f"os_window_class {window_class}\n{shlex.join(['launch'] + window_args)}\n"
+        args.append("--session=-")
+    else:
+        args += window_args
+
+    process = subprocess.Popen(args, start_new_session=True,
+                               stdin=subprocess.PIPE if session else subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if session:
+        process.stdin.write(session.encode("utf-8"))
+        process.stdin.close()
+
+
+def launch(name, fullscreen, title, command):
+    window_class = CLASS_PREFIX + name if name else None
+    if window_class:
+        try:
+            address = find_window(window_class)
+        except (OSError, RuntimeError, ValueError):
+            address = None
+        if address:
+            hypripc.request(f"dispatch focuswindow address:{address}")
+            return
+
+    # always explicit: left out, kitty reuses the class the instance started with
+    payload = {"type": "os-window", "args": command,
+               "os_window_class": window_class or DEFAULT_CLASS}
+    if title:
+        payload["window_title"] = title
+    if fullscreen:
+        payload["os_window_state"] = "fullscreen"
+
+    try:
+        remote_command("launch", payload)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # no shared instance yet, or a stale socket left by a crashed one
+        if os.path.exists(SOCKET_PATH):
+            os.remove(SOCKET_PATH)
+        spawn_instance(window_class, fullscreen, title, command)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    launch_parser = subparsers.add_parser("launch", help="open a window in the shared kitty")
+    launch_parser.add_argument("--name", help="single-window name; focuses it if already open")
+    launch_parser.add_argument("--title")
+    launch_parser.add_argument("--fullscreen", action="store_true")
+    launch_parser.add_argument("args", nargs=argparse.REMAINDER,
+                               help="command to run (default: shell)")
+
+    compact_parser = subparsers.add_parser("compact", help="compact a kitty.conf in place")
+    compact_parser.add_argument("path")
+
+    args = parser.parse_args()
+
+    if args.command == "launch":
+        command = args.args[1:] if args.args[:1] == ["--"] else args.args
+        try:
+            launch(args.name, args.fullscreen, args.title, command)
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"kittyctl: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    elif args.command == "compact":
+        compact_file(args.path)
+
+
+if __name__ == "__main__":
+    main()
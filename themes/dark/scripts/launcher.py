@@ -0,0 +1,377 @@
+#!/usr/bin/python
+
+# Cached application launcher for rofi script mode.
+#
+# Stock `rofi -show drun` parses every .desktop file and looks up every icon
+# on each launch. This backend keeps that work in an index under
+# ~/.cache/cachyhyprdark/launcher/ and rebuilds it only when an applications
+# or icon directory changed (mtime check - package installs and removals
+# rename files into place, which updates the directory). Results are ranked
+# by launch frecency: every launch adds 1 to an exponentially decaying score.
+#
+# rofi runs it as the "apps" mode (see rofi/config.rasi):
+#   rofi -show apps
+# `bench` compares open-to-first-frame latency against stock drun.
+
+import os
+import re
+import sys
+import json
+import time
+import shlex
+import argparse
+
+# configparser, subprocess, statistics and the Hyprland IPC modules are
+# imported where needed: they are only used on index rebuilds, launches and
+# benchmarks, and rofi waits on every plain listing.
+
+STATE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "cachyhyprdark", "launcher"
+)
+INDEX_FILE = "index.json"
+FRECENCY_FILE = "frecency.json"
+INDEX_VERSION = 2
+
+# the icon theme is whatever rofi is configured with (deployed next door)
+ROFI_CONFIG = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "rofi", "config.rasi")
+FALLBACK_ICON_THEME = "hicolor"
+ICON_EXTENSIONS = (".svg", ".png", ".xpm")
+# preferred icon directories first; anything else found counts as a fallback
+ICON_SIZES = ["scalable", "64x64", "48x48", "96x96", "128x128", "256x256", "32x32"]
+
+TERMINAL = "kitty"
+# a launch counts half as much after this many days
+HALF_LIFE_DAYS = 14
+CURRENT_DESKTOP = os.environ.get("XDG_CURRENT_DESKTOP", "Hyprland").split(":")
+
+
+def icon_theme():
+    try:
+        with open(ROFI_CONFIG, "r") as config_file:
+            match = re.search(r'^\s*icon-theme:\s*"([^"]+)"', config_file.read(), re.MULTILINE)
+    except OSError:
+        match = None
+    return match.group(1) if match else FALLBACK_ICON_THEME
+
+
+def data_dirs():
+    home = os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))
+    system = os.environ.get("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(":")
+    return [home] + [path for path in system if path]
+
+
+def application_dirs():
+    return [os.path.join(path, "applications") for path in data_dirs()]
+
+
+def icon_dirs():
+    dirs = [os.path.expanduser("~/.icons")]
+    dirs += [os.path.join(path, "icons") for path in data_dirs()]
+    return dirs
+
+
+def watched_dirs(theme):
+    # Every directory whose mtime invalidates the index
+    dirs = []
+    for root in application_dirs():
+        for path, _, _ in os.walk(root):
+            dirs.append(path)
+    # icon packages re-run gtk-update-icon-cache, which rewrites
+    # icon-theme.cache at the top of the theme directory
+    for root in icon_dirs():
+        for name in (theme, "hicolor"):
+            dirs.append(os.path.join(root, name))
+    dirs.append("/usr/share/pixmaps")
+    return dirs
+
+
+def dir_mtimes(theme):
+    mtimes = {}
+    for path in watched_dirs(theme):
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def build_icon_map(theme):
+    # name -> path for the configured theme, then hicolor, then pixmaps
+    icons = {}
+    for name in (theme, "hicolor"):
+        for root in icon_dirs():
+            theme_dir = os.path.join(root, name)
+            if not os.path.isdir(theme_dir):
+                continue
+            found = {}
+            for path, _, files in os.walk(theme_dir):
+                size = os.path.relpath(path, theme_dir).split(os.sep)[0]
+                rank = ICON_SIZES.index(size) if size in ICON_SIZES else len(ICON_SIZES)
+                for filename in files:
+                    name, ext = os.path.splitext(filename)
+                    if ext not in ICON_EXTENSIONS or name in icons:
+                        continue
+                    if name not in found or rank < found[name][0]:
+                        found[name] = (rank, os.path.join(path, filename))
+            for name, (_, path) in found.items():
+                icons.setdefault(name, path)
+
+    if os.path.isdir("/usr/share/pixmaps"):
+        for filename in os.listdir("/usr/share/pixmaps"):
+            name, ext = os.path.splitext(filename)
+            if ext in ICON_EXTENSIONS:
+                icons.setdefault(name, os.path.join("/usr/share/pixmaps", filename))
+    return icons
+
+
+def which(command):
+    if os.path.isabs(command):
+        return os.access(command, os.X_OK)
+    for path in os.environ.get("PATH", "").split(":"):
+        if os.access(os.path.join(path, command), os.X_OK):
+            return True
+    return False
+
+
+def parse_desktop_file(path):
+    import configparser
+
+    parser = configparser.RawConfigParser(strict=False, interpolation=None)
+    parser.optionxform = str
+    try:
+        parser.read(path, encoding="utf-8")
+    except (configparser.Error, UnicodeDecodeError):
+        return None
+    if not parser.has_section("Desktop Entry"):
+        return None
+    entry = parser["Desktop Entry"]
+
+    if entry.get("Type", "Application") != "Application" or "Exec" not in entry:
+        return None
+    if entry.get("NoDisplay") == "true" or entry.get("Hidden") == "true":
+        return None
+    only_show_in = [desktop for desktop in entry.get("OnlyShowIn", "").split(";") if desktop]
+    if only_show_in and not set(only_show_in) & set(CURRENT_DESKTOP):
+        return None
+    if set(entry.get("NotShowIn", "").split(";")) & set(CURRENT_DESKTOP):
+        return None
+    if "TryExec" in entry and not which(entry["TryExec"]):
+        return None
+    try:
+        shlex.split(entry["Exec"])
+    except ValueError:
+        # unbalanced quoting; nothing sensible to run
+        return None
+
+    return {
+        "name": entry.get("Name", os.path.basename(path)),
+        "generic": entry.get("GenericName", ""),
+        "keywords": entry.get("Keywords", "").replace(";", " ").strip(),
+        "exec": entry["Exec"],
+        "icon": entry.get("Icon", ""),
+        "terminal": entry.get("Terminal") == "true",
+    }
+
+
+def build_index(theme):
+    icons = build_icon_map(theme)
+    entries = {}
+    # earlier data dirs win, so a desktop id found in ~/.local/share overrides /usr/share
+    for root in application_dirs():
+        for path, _, files in os.walk(root):
+            for filename in sorted(files):
+                if not filename.endswith(".desktop"):
+                    continue
+                full_path = os.path.join(path, filename)
+                desktop_id = os.path.relpath(full_path, root).replace(os.sep, "-")
+                if desktop_id in entries:
+                    continue
+                entry = parse_desktop_file(full_path)
+                # remember hidden ids too, so they still shadow lower dirs
+                entries[desktop_id] = entry
+                if entry and entry["icon"]:
+                    icon = entry["icon"]
+                    entry["icon"] = icon if os.path.isabs(icon) else icons.get(icon, "")
+
+    return {
+        "version": INDEX_VERSION,
+        "icon_theme": theme,
+        "mtimes": dir_mtimes(theme),
+        "entries": {desktop_id: entry for desktop_id, entry in entries.items() if entry},
+    }
+
+
+def write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as json_file:
+        json.dump(data, json_file)
+    os.replace(tmp_path, path)
+
+
+def read_json(path, default):
+    try:
+        with open(path, "r") as json_file:
+            return json.load(json_file)
+    except (OSError, ValueError):
+        return default
+
+
+def load_index(state_dir, force=False):
+    index_path = os.path.join(state_dir, INDEX_FILE)
+    index = read_json(index_path, None)
+    theme = icon_theme()
+    if (force or not index or index.get("version") != INDEX_VERSION
+            or index.get("icon_theme") != theme or index.get("mtimes") != dir_mtimes(theme)):
+        os.makedirs(state_dir, exist_ok=True)
+        index = build_index(theme)
+        write_json(index_path, index)
+    return index
+
+
+def frecency_score(record, now):
+    age_days = (now - record["last"]) / 86400
+    return record["score"] * 0.5 ** (age_days / HALF_LIFE_DAYS)
+
+
+def record_launch(state_dir, desktop_id):
+    path = os.path.join(state_dir, FRECENCY_FILE)
+    frecency = read_json(path, {})
+    now = time.time()
+    record = frecency.get(desktop_id)
+    score = frecency_score(record, now) if record else 0.0
+    frecency[desktop_id] = {"score": score + 1, "last": now}
+    write_json(path, frecency)
+
+
+def ranked_entries(index, frecency):
+    now = time.time()
+
+    def sort_key(item):
+        desktop_id, entry = item
+        record = frecency.get(desktop_id)
+        return (-(frecency_score(record, now) if record else 0.0), entry["name"].lower())
+
+    return sorted(index["entries"].items(), key=sort_key)
+
+
+def rofi_rows(index, frecency):
+    rows = ["\0no-custom\x1ftrue"]
+    for desktop_id, entry in ranked_entries(index, frecency):
+        name = entry["name"].replace("\n", " ")
+        meta = " ".join([entry["generic"], entry["keywords"], desktop_id])
+        options = [f"info\x1f{desktop_id}", f"meta\x1f{meta}"]
+        if entry["icon"]:
+            options.insert(0, f"icon\x1f{entry['icon']}")
+        rows.append(name + "\0" + "\x1f".join(options))
+    return "\n".join(rows) + "\n"
+
+
+def command_line(entry):
+    # Drop desktop-entry field codes (%f %U %i ...); %% is a literal percent
+    args = []
+    for arg in shlex.split(entry["exec"]):
+        if len(arg) == 2 and arg[0] == "%":
+            if arg == "%%":
+                args.append("%")
+            continue
+        args.append(arg.replace("%%", "%"))
+    if entry["terminal"]:
+        args = [TERMINAL, "-e"] + args
+    return shlex.join(args)
+
+
+def launch(state_dir, desktop_id):
+    import hyprdispatch
+
+    index = load_index(state_dir)
+    entry = index["entries"].get(desktop_id)
+    if not entry:
+        return
+    # Hyprland spawns the app itself, so it is not a child of rofi
+    hyprdispatch.client(hyprdispatch.FIFO_PATH, [f"dispatch exec {command_line(entry)}"])
+    record_launch(state_dir, desktop_id)
+
+
+def first_frame(command, timeout):
+    # Seconds from spawning rofi until Hyprland maps its layer surface
+    import subprocess
+    import hypripc
+
+    with hypripc.EventStream() as stream:
+        start = time.monotonic()
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed = None
+        try:
+            while time.monotonic() - start < timeout:
+                received = stream.read(timeout=0.05)
+                if any(name == "openlayer" and data == "rofi" for name, data in received):
+                    elapsed = time.monotonic() - start
+                    break
+        finally:
+            process.terminate()
+            process.wait()
+    return elapsed
+
+
+def bench(state_dir, runs, timeout):
+    import statistics
+
+    script = f"{sys.executable} {os.path.realpath(__file__)}"
+    commands = {
+        "drun (stock)": ["rofi", "-show", "drun"],
+        "apps (indexed)": ["rofi", "-show", "apps", "-modi", f"apps:{script}"],
+    }
+
+    start = time.monotonic()
+    load_index(state_dir, force=True)
+    print(f"index rebuild: {(time.monotonic() - start) * 1000:.1f} ms")
+    start = time.monotonic()
+    rofi_rows(load_index(state_dir), read_json(os.path.join(state_dir, FRECENCY_FILE), {}))
+    print(f"cached listing: {(time.monotonic() - start) * 1000:.1f} ms")
+
+    for label, command in commands.items():
+        samples = []
+        for _ in range(runs):
+            elapsed = first_frame(command, timeout)
+            if elapsed is not None:
+                samples.append(elapsed * 1000)
+            # let rofi's layer close before the next run
+            time.sleep(0.2)
+        if not samples:
+            print(f"{label}: no frame within {timeout:.0f}s")
+            continue
+        print(f"{label}: median {statistics.median(samples):.1f} ms, "
+              f"min {min(samples):.1f} ms, max {max(samples):.1f} ms ({len(samples)} runs)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--state-dir", default=STATE_DIR)
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index and exit")
+    parser.add_argument("--bench", action="store_true",
+                        help="compare open-to-first-frame latency with rofi -show drun")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    # rofi passes the selected row as an argument
+    parser.add_argument("selection", nargs="?")
+
+    args = parser.parse_args()
+
+    if args.rebuild:
+        load_index(args.state_dir, force=True)
+
+    elif args.bench:
+        bench(args.state_dir, args.runs, args.timeout)
+
+    elif os.environ.get("ROFI_RETV", "0") == "1":
+        launch(args.state_dir, os.environ.get("ROFI_INFO", ""))
+
+    else:
+        index = load_index(args.state_dir)
+        frecency = read_json(os.path.join(args.state_dir, FRECENCY_FILE), {})
+        sys.stdout.write(rofi_rows(index, frecency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/python
+
+# Render performance profiles for Hyprland.
+#
+# `generate` reads the decoration/animations/misc sections of the deployed
+# hyprland.conf and writes sourceable fragments for each profile to
+# ~/.config/hypr/profiles/. hyprland.conf sources profiles/active.conf last,
+# so the active profile survives `hyprctl reload`.
+#
+# `apply` switches profile at runtime: every keyword goes to Hyprland in one
+# batched IPC request (same as `hyprctl --batch`), then active.conf is
+# replaced atomically. active.conf is a sourced file, so unless
+# misc:disable_autoreload is set Hyprland also reloads its config once
+# after the rewrite; the result is the same profile either way.
+#
+# `generate` re-renders active.conf from the new fragments too, so edits to
+# hyprland.conf reach the active profile instead of being masked by it.
+
+import os
+import sys
+import argparse
+
+import hypripc
+
+HYPR_CONFIG = os.path.expanduser("~/.config/hypr/hyprland.conf")
+PROFILE_DIR = os.path.expanduser("~/.config/hypr/profiles")
+ACTIVE_PROFILE = "active.conf"
+SECTIONS = ["decoration", "animations", "misc"]
+
+# Repeatable keywords that define things rather than set a value
+REPEATED_KEYWORDS = {"animation", "bezier"}
+
+# Hyprland defaults for keys a profile may set even when hyprland.conf
+# leaves them out, so "full" can always restore them.
+DEFAULTS = {
+    "decoration:blur:enabled": "true",
+    "decoration:rounding": "0",
+    "animations:enabled": "true",
+    "misc:vrr": "0",
+}
+
+BOOLEAN_VALUES = {"true": "1", "yes": "1", "on": "1", "false": "0", "no": "0", "off": "0"}
+
+# Overrides per profile. Keys that are neither in hyprland.conf nor in
+# DEFAULTS are skipped, which keeps old (drop_shadow) and new
+# (shadow:enabled) Hyprland option names from erroring.
+LOW_LATENCY = {
+    "decoration:rounding": "0",
+    "decoration:blur:enabled": "false",
+    "decoration:drop_shadow": "false",
+    "decoration:shadow:enabled": "false",
+    "decoration:dim_inactive": "false",
+    "animations:enabled": "false",
+}
+PROFILES = {
+    "full": {},
+    "low-latency": LOW_LATENCY,
+    # everything low-latency strips, plus VRR so panels that support it can
+    # drop their refresh rate while the screen is idle
+    "battery": dict(LOW_LATENCY, **{"misc:vrr": "1"}),
+}
+
+
+def parse_config(path, sections=SECTIONS):
+    # Flatten nested blocks into "section:sub:key" -> value for the
+    # requested top-level sections. Later assignments win, like in Hyprland.
+    values = {}
+    stack = []
+    with open(path, "r") as config_file:
+        for line in config_file:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+
+            if line.endswith("{"):
+                stack.append(line[:-1].strip())
+                continue
+            if line == "}":
+                if stack:
+                    stack.pop()
+                continue
+
+            key, sep, value = line.partition("=")
+            if not sep:
+                continue
+            key = key.strip()
+            path_parts = stack + key.split(":")
+            if path_parts[0] not in sections or path_parts[-1] in REPEATED_KEYWORDS:
+                continue
+            values[":".join(path_parts)] = value.strip()
+    return values
+
+
+def same_value(a, b):
+    a, b = a.strip().lower(), b.strip().lower()
+    return BOOLEAN_VALUES.get(a, a) == BOOLEAN_VALUES.get(b, b)
+
+
+def build_profiles(config_values):
+    known = dict(DEFAULTS)
+    known.update(config_values)
+
+    # only keys some profile actually changes; "full" restores just those
+    touched = set()
+    for overrides in PROFILES.values():
+        touched.update(key for key, value in overrides.items()
+                       if key in known and not same_value(value, known[key]))
+
+    baseline = {key: known[key] for key in sorted(touched)}
+    profiles = {}
+    for name, overrides in PROFILES.items():
+        profile = dict(baseline)
+        profile.update({key: value for key, value in overrides.items() if key in touched})
+        profiles[name] = profile
+    return profiles
+
+
+def render_profile(name, profile):
+    lines = [f"# profile: {name}", "# generated by perfprofile.py - do not edit, re-run generate"]
+    lines += [f"{key} = {value}" for key, value in profile.items()]
+    return "\n".join(lines) + "\n"
+
+
+def read_profile(path):
+    name = None
+    profile = {}
+    with open(path, "r") as profile_file:
+        for line in profile_file:
+            line = line.strip()
+            if line.startswith("# profile:"):
+                name = line.split(":", 1)[1].strip()
+                continue
+            if not line or line.startswith("#"):
+                continue
+            key, _, value = line.partition("=")
+            profile[key.strip()] = value.strip()
+    return name, profile
+
+
+def write_atomic(path, content):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as tmp_file:
+        tmp_file.write(content)
+    os.replace(tmp_path, path)
+
+
+def active_profile(profile_dir=PROFILE_DIR):
+    path = os.path.join(profile_dir, ACTIVE_PROFILE)
+    if not os.path.exists(path):
+        return None
+    return read_profile(path)[0]
+
+
+def generate(config_path, profile_dir, default=None):
+    os.makedirs(profile_dir, exist_ok=True)
+    profiles = build_profiles(parse_config(config_path))
+    for name, profile in profiles.items():
+        write_atomic(os.path.join(profile_dir, f"{name}.conf"), render_profile(name, profile))
+
+    # keep whatever the user switched to, but with freshly generated values
+    current = active_profile(profile_dir)
+    name = current if current in profiles else default
+    if name:
+        write_atomic(os.path.join(profile_dir, ACTIVE_PROFILE), render_profile(name, profiles[name]))
+    return profiles
+
+
+def load_profile(name, profile_dir=PROFILE_DIR):
+    return read_profile(os.path.join(profile_dir, f"{name}.conf"))[1]
+
+
+def send_profile(name, profile):
+    reply = hypripc.batch([f"keyword {key} {value}" for key, value in profile.items()])
+    # a batch answers "ok" per command, anything else is an error message
+    errors = reply.replace("ok", "").strip()
+    if errors:
+        raise RuntimeError(f"Hyprland rejected profile '{name}': {errors}")
+
+
+def apply(name, profile_dir=PROFILE_DIR, live=True):
+    profile = load_profile(name, profile_dir)
+    if live:
+        send_profile(name, profile)
+    write_atomic(os.path.join(profile_dir, ACTIVE_PROFILE), render_profile(name, profile))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile-dir", default=PROFILE_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser("generate", help="write profile fragments")
+    generate_parser.add_argument("--config", default=HYPR_CONFIG)
+    generate_parser.add_argument("--default", choices=list(PROFILES),
+                                 help="profile to activate if none is active yet")
+
+    apply_parser = subparsers.add_parser("apply", help="switch profile at runtime")
+    apply_parser.add_argument("name", choices=list(PROFILES))
+    apply_parser.add_argument("--no-live", action="store_true",
+                              help="only update active.conf (takes effect on reload)")
+
+    subparsers.add_parser("list", help="show profiles, marking the active one")
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate(args.config, args.profile_dir, args.default)
+
+    elif args.command == "apply":
+        try:
+            apply(args.name, args.profile_dir, live=not args.no_live)
+        except (OSError, RuntimeError) as e:
+            print(f"perfprofile: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    elif args.command == "list":
+        current = active_profile(args.profile_dir)
+        for name in PROFILES:
+            print(f"{'*' if name == current else ' '} {name}")
+
+
+if __name__ == "__main__":
+    main()
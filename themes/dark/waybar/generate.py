@@ -1,8 +1,16 @@
 #!/usr/bin/python
 
 import os
+import sys
+import copy
 import json
+import time
 import argparse
+import subprocess
+
+# shared Hyprland IPC helpers are deployed next door in ../scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "scripts"))
+import hypripc
 
 CSS_TEMPLATE = """
 * {
@@ -60,6 +68,32 @@ BACKLIGHT_MODULE = "backlight"
 VOLUME_MODULE = "pulseaudio"
 TRAY_MODULE = "tray"
 
+MONITOR_EVENTS = {"monitoradded", "monitorremoved"}
+# a dock or KVM switch brings several outputs at once: rebuild once no
+# monitor event has arrived for this long
+HOTPLUG_SETTLE = 0.5
+
+# The last manual run's flags are saved here; --watch regenerates with them
+ARGS_FILE = "generate-args.json"
+SAVED_FLAGS = ["weather", "updates", "daily", "sysinfo", "network", "bluetooth",
+               "battery", "volume", "primary"]
+# Present while game mode wants every bar light (no 1 s pollers)
+LIGHT_MARKER = "light-bars"
+
+HYPRDISPATCH_FIFO = "$XDG_RUNTIME_DIR/hyprdispatch.fifo"
+HYPRDISPATCH_PID = "$XDG_RUNTIME_DIR/hyprdispatch.pid"
+
+# Opens htop in the shared kitty instance, or focuses it if already open
+HTOP_ON_CLICK = "python ~/.config/hypr/themes/dark/scripts/kittyctl.py launch --name htop --fullscreen -- htop"
+
+
+def hyprdispatch(command):
+    # Queue the command on the resident dispatcher (scripts/hyprdispatch.py)
+    # with shell builtins; fall back to hyprctl unless its pidfile names a
+    # live process. See hyprdispatch.py for why the fifo is opened with 1<>.
+    return ("read pid 2>/dev/null < {0} && kill -0 $pid 2>/dev/null && echo '{2}' 1<> {1} "
+            "|| hyprctl {2}").format(HYPRDISPATCH_PID, HYPRDISPATCH_FIFO, command)
+
 
 def hyprland_workspaces_json():
     return {
@@ -67,8 +101,8 @@ def hyprland_workspaces_json():
         "disable-scroll": True,
         "all-outputs": True,
         "on-click": "activate",
-        "on-scroll-up": "hyprctl dispatch workspace e+1",
-        "on-scroll-down": "hyprctl dispatch workspace e-1",
+        "on-scroll-up": hyprdispatch("dispatch workspace e+1"),
+        "on-scroll-down": hyprdispatch("dispatch workspace e-1"),
     }
 
 
@@ -123,7 +157,7 @@ def cpu_json():
     return {
         "interval": 1,
         "format": " {usage}%",
-        "on-click": "kitty --start-as=fullscreen --title htop sh -c 'htop'"
+        "on-click": HTOP_ON_CLICK
     }
 
 
@@ -133,7 +167,7 @@ def memory_json():
         "format": " {}%",
         "tooltip": True,
         "tooltip-format": "Memory - {used:0.1f}GB used",
-        "on-click": "kitty --start-as=fullscreen --title htop sh -c 'htop'"
+        "on-click": HTOP_ON_CLICK
     }
 
 
@@ -146,7 +180,7 @@ def disk_json():
         "format-alt": "󰋊 {percentage_used}%",
         "tooltip": True,
         "tooltip-format": "Disk - {used} used out of {total} on {path} ({percentage_used}%)",
-        "on-click": "kitty --start-as=fullscreen --title htop sh -c 'htop'"
+        "on-click": HTOP_ON_CLICK
     }
 
 
@@ -498,21 +532,7 @@ def get_margin_for(module, island):
     return "3px 0px 3px 0px"
 
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--weather", action="store_true")
-    parser.add_argument("--updates", action="store_true")
-    parser.add_argument("--daily", action="store_true")
-    parser.add_argument("--sysinfo", action="store_true")
-    parser.add_argument("--network", action="store_true")
-    parser.add_argument("--bluetooth", action="store_true")
-    parser.add_argument("--battery", action="store_true")
-    parser.add_argument("--volume", action="store_true")
-
-    args = parser.parse_args()
-
-    path_to_dir = os.path.dirname(os.path.realpath(__file__))
-
+def build_bar(args, colors, full=True):
     workspaces_island = [HYPRLAND_WORKSPACES]
     window_island = [HYPRLAND_WINDOW]
     clock_island = [CLOCK_MODULE]
@@ -542,27 +562,26 @@ def main():
 
     tray_island = [TRAY_MODULE]
 
-    with open(os.path.join(path_to_dir, "colors.conf"), "r") as colors_file:
-        colors = colors_file.readlines()
-        colors = [color.strip() for color in colors
-                  if color.strip() != "" and not color.startswith("#")]
-        colors = ["@define-color " + color for color in colors]
-
-    json_template = JSON_TEMPLATE
+    json_template = copy.deepcopy(JSON_TEMPLATE)
     css_template = "\n".join(colors) + "\n\n" + CSS_TEMPLATE
 
     json_template["modules-left"].append(HYPRLAND_WORKSPACES)
     json_template[HYPRLAND_WORKSPACES] = hyprland_workspaces_json()
     css_template += hyprland_workspaces_css(workspaces_island)
 
-    json_template["modules-left"].append(HYPRLAND_WINDOW)
-    json_template[HYPRLAND_WINDOW] = hyprland_window_json()
-    css_template += hyprland_window_css(window_island)
-
     json_template["modules-center"].append(CLOCK_MODULE)
     json_template[CLOCK_MODULE] = clock_json()
     css_template += clock_css(clock_island)
 
+    # Secondary outputs only get workspaces and a once-a-minute clock
+    if not full:
+        json_template[CLOCK_MODULE]["interval"] = 60
+        return json_template, css_template
+
+    json_template["modules-left"].append(HYPRLAND_WINDOW)
+    json_template[HYPRLAND_WINDOW] = hyprland_window_json()
+    css_template += hyprland_window_css(window_island)
+
     if args.weather:
         json_template["modules-right"].append(WEATHER_MODULE)
         json_template[WEATHER_MODULE] = weather_json()
@@ -619,14 +638,161 @@ def main():
     json_template[TRAY_MODULE] = tray_json()
     css_template += tray_css(tray_island)
 
-    path_to_json = os.path.join(path_to_dir, "config.jsonc")
-    path_to_css = os.path.join(path_to_dir, "style.css")
+    return json_template, css_template
+
+
+def read_monitors(snapshot):
+    # Current outputs from Hyprland, or a saved `hyprctl monitors -j` snapshot
+    if snapshot:
+        with open(snapshot, "r") as snapshot_file:
+            return json.load(snapshot_file)
+    try:
+        return hypripc.request("monitors", json_output=True)
+    except (OSError, RuntimeError, ValueError):
+        return []
+
+
+def build_config(args, colors, monitors, light=False):
+    full_bar, css_template = build_bar(args, colors, full=not light)
+
+    # Unknown layout or a single screen: one full bar that follows any output
+    if len(monitors) < 2:
+        return full_bar, css_template
+
+    names = [monitor["name"] for monitor in monitors]
+    if args.primary in names:
+        primary = args.primary
+    else:
+        primary = min(monitors, key=lambda monitor: monitor["id"])["name"]
+
+    bars = []
+    for name in names:
+        bar = full_bar if name == primary else build_bar(args, colors, full=False)[0]
+        bar = dict(bar, output=name)
+        bars.append(bar)
+    return bars, css_template
+
+
+def write_config(args, path_to_dir):
+    with open(os.path.join(path_to_dir, "colors.conf"), "r") as colors_file:
+        colors = colors_file.readlines()
+        colors = [color.strip() for color in colors
+                  if color.strip() != "" and not color.startswith("#")]
+        colors = ["@define-color " + color for color in colors]
 
-    with open(path_to_json, "w") as json_file:
-        json.dump(json_template, json_file, indent=4)
+    light = os.path.exists(os.path.join(path_to_dir, LIGHT_MARKER))
+    json_template, css_template = build_config(args, colors, read_monitors(args.monitors), light)
+
+    # Returns whether anything changed, so callers only reload waybar when needed
+    changed = False
+    for filename, content in [("config.jsonc", json.dumps(json_template, indent=4)),
+                              ("style.css", css_template)]:
+        path = os.path.join(path_to_dir, filename)
+        try:
+            with open(path, "r") as old_file:
+                if old_file.read() == content:
+                    continue
+        except OSError:
+            pass
+        with open(path + ".tmp", "w") as new_file:
+            new_file.write(content)
+        os.replace(path + ".tmp", path)
+        changed = True
+    return changed
+
+
+def save_flags(args, path_to_dir):
+    path = os.path.join(path_to_dir, ARGS_FILE)
+    with open(path + ".tmp", "w") as args_file:
+        json.dump({flag: getattr(args, flag) for flag in SAVED_FLAGS}, args_file, indent=4)
+    os.replace(path + ".tmp", path)
+
+
+def load_flags(args, path_to_dir):
+    try:
+        with open(os.path.join(path_to_dir, ARGS_FILE), "r") as args_file:
+            saved = json.load(args_file)
+    except (OSError, ValueError):
+        return
+    for flag in SAVED_FLAGS:
+        if flag in saved:
+            setattr(args, flag, saved[flag])
+
+
+def set_light(args, path_to_dir, light):
+    # Switch every bar to (or back from) the light bar, keeping the saved
+    # flags, and have waybar reload if that changed anything
+    marker = os.path.join(path_to_dir, LIGHT_MARKER)
+    if light:
+        open(marker, "w").close()
+    elif os.path.exists(marker):
+        os.remove(marker)
+    load_flags(args, path_to_dir)
+    if write_config(args, path_to_dir):
+        subprocess.call(["pkill", "-USR2", "-x", "waybar"])
+
+
+def watch(args, path_to_dir, launch_bar=False):
+    # Regenerate on monitor hotplug and have waybar reload its config
+    with hypripc.EventStream() as stream:
+        # The first pass never signals: a waybar started alongside us may not
+        # have its SIGUSR2 handler yet, and the default action kills it. With
+        # launch_bar, waybar starts only now, so it reads this session's config.
+        load_flags(args, path_to_dir)
+        write_config(args, path_to_dir)
+        if launch_bar:
+            subprocess.Popen(["waybar"], start_new_session=True)
+        while True:
+            while not any(name in MONITOR_EVENTS for name, _ in stream.read()):
+                pass
+            # other events (title changes...) must not hold the rebuild back
+            deadline = time.monotonic() + HOTPLUG_SETTLE
+            remaining = HOTPLUG_SETTLE
+            while remaining > 0:
+                if any(name in MONITOR_EVENTS for name, _ in stream.read(timeout=remaining)):
+                    deadline = time.monotonic() + HOTPLUG_SETTLE
+                remaining = deadline - time.monotonic()
+
+            # pick up flags from a manual run since the last pass
+            load_flags(args, path_to_dir)
+            if write_config(args, path_to_dir):
+                subprocess.call(["pkill", "-USR2", "-x", "waybar"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--weather", action="store_true")
+    parser.add_argument("--updates", action="store_true")
+    parser.add_argument("--daily", action="store_true")
+    parser.add_argument("--sysinfo", action="store_true")
+    parser.add_argument("--network", action="store_true")
+    parser.add_argument("--bluetooth", action="store_true")
+    parser.add_argument("--battery", action="store_true")
+    parser.add_argument("--volume", action="store_true")
+    parser.add_argument("--monitors", help="saved `hyprctl monitors -j` output to use instead of Hyprland")
+    parser.add_argument("--primary", help="output that gets the full bar (default: lowest monitor id)")
+    parser.add_argument("--watch", action="store_true",
+                        help="regenerate on monitor hotplug, with the flags of the last run "
+                             f"({ARGS_FILE}) if there was one")
+    parser.add_argument("--launch-bar", action="store_true",
+                        help="with --watch: start waybar once the first config is written")
+    parser.add_argument("--light", choices=["on", "off"],
+                        help="light bars on every output (game mode), with the saved flags")
+
+    args = parser.parse_args()
+
+    path_to_dir = os.path.dirname(os.path.realpath(__file__))
 
-    with open(path_to_css, "w") as css_file:
-        css_file.write(css_template)
+    if args.light:
+        set_light(args, path_to_dir, args.light == "on")
+    elif args.watch:
+        try:
+            watch(args, path_to_dir, args.launch_bar)
+        except EOFError:
+            pass
+    else:
+        write_config(args, path_to_dir)
+        save_flags(args, path_to_dir)
 
 
 if __name__ == "__main__":